@@ -0,0 +1,151 @@
+import time
+import asyncio
+import numpy as np
+
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Sequence
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded in-process LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.pop(key, None)
+        if entry is None or entry[0] <= time.monotonic():
+            return default
+        return entry[1]
+
+    def purge_expired(self) -> int:
+        now = time.monotonic()
+        expired = [
+            key for key, (expires_at, _) in self._data.items() if expires_at <= now
+        ]
+        for key in expired:
+            del self._data[key]
+        return len(expired)
+
+    def clear(self):
+        self._data.clear()
+
+
+class SingleFlight:
+    """Shares one in-flight call per key between all concurrent callers."""
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        # Shielded so one caller giving up does not cancel the call for the rest.
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            future.exception()
+
+
+class SemanticCache:
+    """FIFO cache of results keyed by query embedding similarity.
+
+    A lookup hits when a stored entry has the same ``key`` and its embedding has a
+    cosine similarity of at least ``threshold`` with the query. All entries are
+    dropped whenever the caller passes a new ``version``.
+    """
+
+    def __init__(self, maxsize: int, threshold: float):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.version: Hashable = None
+        self._vectors: np.ndarray | None = None
+        self._keys: list[Hashable] = []
+        self._values: list[Any] = []
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def get(self, vector: Sequence[float], key: Hashable, version: Hashable) -> Any:
+        if version != self.version:
+            self.clear()
+            self.version = version
+            return None
+        if not self._keys:
+            return None
+
+        scores = self._vectors[: len(self._keys)] @ self._normalize(vector)
+        candidates = np.flatnonzero(scores >= self.threshold)
+        for i in candidates[np.argsort(-scores[candidates])]:
+            if self._keys[i] == key:
+                return self._values[i]
+        return None
+
+    def set(
+        self, vector: Sequence[float], key: Hashable, value: Any, version: Hashable
+    ):
+        if version != self.version:
+            self.clear()
+            self.version = version
+
+        normalized = self._normalize(vector)
+        if self._vectors is None or self._vectors.shape[1] != normalized.shape[0]:
+            self.clear()
+            self._vectors = np.zeros((self.maxsize, normalized.shape[0]), np.float32)
+
+        i = self._next
+        self._vectors[i] = normalized
+        if i < len(self._keys):
+            self._keys[i] = key
+            self._values[i] = value
+        else:
+            self._keys.append(key)
+            self._values.append(value)
+        self._next = (i + 1) % self.maxsize
+
+    def clear(self):
+        self._keys.clear()
+        self._values.clear()
+        self._next = 0
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
@@ -13,11 +13,24 @@ class Settings(BaseSettings):
     AZURE_OPENAI_ENDPOINT: Optional[str] = None
     BERLINHOUSE_API_KEY: Optional[str] = None
     BERLINHOUSE_BASE_URL: Optional[str] = None
+    BERLINHOUSE_CA_BUNDLE: Optional[str] = None
+    BERLINHOUSE_VERIFY_TLS: bool = True
     BOT_HANDLE: str
     BOT_TOKEN: str
+    CROSS_ENCODER_CANDIDATES: int = 20
     DEFAULT_DATABASE: str
+    EMBEDDING_BATCH_DELAY_MS: int = 20
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_CACHE_SIZE: int = 5000
     EMBEDDING_MODEL: str
+    EPISODE_BATCH_SIZE: int = 16
+    EPISODE_BULK_INGEST: bool = False
+    EPISODE_DRAIN_TIMEOUT: float = 20.0
+    EPISODE_FLUSH_INTERVAL: float = 2.0
+    EPISODE_QUEUE_SIZE: int = 1000
+    GRAPH_CACHE_STALENESS: float = 300.0
     GROUP_ID: str
+    HTTPX_POOL_SIZE: int = 256
     LANGSMITH_API_KEY: str
     LANGSMITH_PROJECT: str
     LANGSMITH_TRACING: bool = True
@@ -31,9 +44,21 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: Optional[str] = None
     PORT: int = 8000
     POSTGRES_CONN_STRING: Optional[str] = None
+    POSTGRES_POOL_MAX_IDLE: float = 600.0
+    POSTGRES_POOL_MAX_LIFETIME: float = 1800.0
+    POSTGRES_POOL_MAX_SIZE: int = 20
+    POSTGRES_POOL_MIN_SIZE: int = 5
+    POSTGRES_PREPARE_THRESHOLD: Optional[int] = None
+    PROMPT_CACHE_TTL: int = 600
     REASONING_MODEL: str
     RERANKER_MODEL: str
+    SEMANTIC_CACHE_SIZE: int = 1000
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95
     SENTRY_DNS: Optional[str] = None
+    TELEGRAM_DRAIN_TIMEOUT: float = 20.0
+    TELEGRAM_QUEUE_SIZE: int = 1000
+    TELEGRAM_WORKERS: int = 8
+    TOOLS_CACHE_TTL: int = 120
     WEBHOOK_URL: str
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
@@ -14,3 +14,7 @@ INTRODUCTION = (
     "needs and interactions to offer accurate, context-aware assistance. Just use commands like /ask or /connect "
     "to get started—I'm always ready to help!"
 )
+
+# Update types the Telegram handlers act on; everything else is dropped before
+# parsing and is not requested from Telegram in the first place.
+HANDLED_UPDATE_TYPES = frozenset({"message", "edited_message", "my_chat_member"})
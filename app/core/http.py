@@ -0,0 +1,71 @@
+import ssl
+import httpx
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LUMA_BASE_URL = "https://api.lu.ma"
+
+
+def _berlinhouse_ssl_context() -> ssl.SSLContext:
+    if not settings.BERLINHOUSE_VERIFY_TLS:
+        logger.warning("TLS verification is disabled for BerlinHouse requests")
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return context
+
+    if settings.BERLINHOUSE_CA_BUNDLE:
+        return ssl.create_default_context(cafile=settings.BERLINHOUSE_CA_BUNDLE)
+
+    return SSL_CONTEXT
+
+
+# Built once so clients don't reload the CA bundle or rebuild TLS settings.
+SSL_CONTEXT = httpx.create_ssl_context()
+BERLINHOUSE_SSL_CONTEXT = _berlinhouse_ssl_context()
+
+
+class HttpClients:
+    """Long-lived outbound HTTP clients shared by tools and handlers."""
+
+    def __init__(self):
+        self.luma: httpx.AsyncClient | None = None
+        self.berlinhouse: httpx.AsyncClient | None = None
+
+    def open(self):
+        limits = httpx.Limits(
+            max_connections=settings.HTTPX_POOL_SIZE,
+            max_keepalive_connections=max(settings.HTTPX_POOL_SIZE // 4, 1),
+            keepalive_expiry=30.0,
+        )
+        timeout = httpx.Timeout(10.0)
+
+        self.luma = httpx.AsyncClient(
+            base_url=LUMA_BASE_URL,
+            limits=limits,
+            timeout=timeout,
+            verify=SSL_CONTEXT,
+            http2=True,
+        )
+        self.berlinhouse = httpx.AsyncClient(
+            base_url=settings.BERLINHOUSE_BASE_URL or "",
+            limits=limits,
+            timeout=timeout,
+            verify=BERLINHOUSE_SSL_CONTEXT,
+            http2=True,
+        )
+        logger.info("HTTP clients opened")
+
+    async def close(self):
+        for client in (self.luma, self.berlinhouse):
+            if client is not None:
+                await client.aclose()
+        self.luma = None
+        self.berlinhouse = None
+        logger.info("HTTP clients closed")
+
+
+http_clients = HttpClients()
@@ -1,11 +1,14 @@
 import os
+import time
+import orjson
 import asyncio
 import logging
 import hashlib
 import base64
 
+from collections import Counter
 from fastapi import FastAPI
-from contextlib import asynccontextmanager
+from contextlib import aclosing, asynccontextmanager
 from langchain_openai import AzureChatOpenAI, ChatOpenAI
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
@@ -25,13 +28,22 @@ from telegram.ext import (
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
 from app.core.config import settings
-from app.core.constants import INTRODUCTION
+from app.core.constants import HANDLED_UPDATE_TYPES, INTRODUCTION
+from app.core.http import http_clients
+from app.core.tools import load_tower_info
 from app.services.ai import ai_service
 from app.services.auth import auth_service
 from app.services.graph import graph_service
 
 logger = logging.getLogger(__name__)
 
+# Telegram allows roughly one edit per second per chat.
+STREAM_EDIT_INTERVAL = 1.0
+
+# Per-update outcomes are logged at DEBUG; totals are summarised periodically.
+UPDATE_STATS_LOG_INTERVAL = 1000
+update_stats: Counter[str] = Counter()
+
 
 def safe_user_log(user_id: int):
     if settings.APP_ENV == "dev":
@@ -61,7 +73,7 @@ checkpointer: AsyncPostgresSaver | MemorySaver | None = None
 connection_kwargs = {
     "autocommit": True,
     "row_factory": dict_row,
-    "prepare_threshold": None,
+    "prepare_threshold": settings.POSTGRES_PREPARE_THRESHOLD,
 }
 
 
@@ -74,7 +86,12 @@ def create_application():
         "ai_service": ai_service,
         "graph_service": graph_service,
     }
-    application = ApplicationBuilder().token(settings.BOT_TOKEN).build()
+    application = (
+        ApplicationBuilder()
+        .token(settings.BOT_TOKEN)
+        .connection_pool_size(settings.HTTPX_POOL_SIZE)
+        .build()
+    )
     application.bot_data.update(bot_data)
 
     application.add_handler(CommandHandler("start", handle_start))
@@ -249,6 +266,29 @@ async def handle_login_direct_message(
         )
 
 
+async def reply_streaming(message, chunks):
+    """Reply with the first streamed text, then edit it as more arrives."""
+    reply = None
+    sent_text = text = ""
+    last_edit = 0.0
+    async for text in chunks:
+        if not text.strip():
+            continue
+        now = time.monotonic()
+        if reply is None:
+            reply = await message.reply_text(
+                text, reply_to_message_id=message.message_id
+            )
+        elif now - last_edit >= STREAM_EDIT_INTERVAL:
+            await reply.edit_text(text)
+        else:
+            continue
+        sent_text, last_edit = text, now
+
+    if reply is not None and text.strip() and text != sent_text:
+        await reply.edit_text(text)
+
+
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not is_valid_text_message(update):
         return
@@ -280,10 +320,12 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 return
             
             # Otherwise, handle as normal message
-            response = await ai_service.agent(update.message.text, user_id)
-            await update.message.reply_text(
-                response, reply_to_message_id=update.message.message_id
-            )
+            # Close the stream even if Telegram rejects a send, releasing the
+            # per-thread lock the generator holds.
+            async with aclosing(
+                ai_service.agent_stream(update.message.text, user_id)
+            ) as chunks:
+                await reply_streaming(update.message, chunks)
         except Exception as e:
             logger.error(
                 f"Failed to process direct message for user "
@@ -336,13 +378,7 @@ async def handle_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     try:
-        response = ""
-        if command == "ask":
-            response = await ai_service.handle_ask(text_after_command)
-        elif command == "connect":
-            response = await ai_service.handle_connect(text_after_command)
-        elif command == "request":
-            response = await ai_service.handle_request(text_after_command)
+        response = await ai_service.run_command(command, text_after_command)
 
         if response:
             await update.message.reply_text(
@@ -359,10 +395,51 @@ async def handle_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         raise
 
 
+async def process_telegram_update(tg_app, bot, raw_update: bytes):
+    try:
+        update_data = orjson.loads(raw_update)
+        if HANDLED_UPDATE_TYPES.isdisjoint(update_data):
+            update_stats["skipped"] += 1
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Skipping unhandled Telegram update %s",
+                    update_data.get("update_id"),
+                )
+            return
+
+        update = Update.de_json(data=update_data, bot=bot)
+        logger.debug("Processing Telegram update %s", update.update_id)
+        await tg_app.process_update(update)
+        update_stats["processed"] += 1
+        logger.debug("Finished processing Telegram update %s", update.update_id)
+    except Exception as e:
+        update_stats["failed"] += 1
+        logger.error("Failed to process Telegram update: %s", e, exc_info=True)
+
+
+async def telegram_update_worker(tg_app, update_queue: asyncio.Queue):
+    bot = tg_app.bot
+    while True:
+        raw_update = await update_queue.get()
+        try:
+            await process_telegram_update(tg_app, bot, raw_update)
+        finally:
+            update_queue.task_done()
+            handled = update_stats.total()
+            if handled and handled % UPDATE_STATS_LOG_INTERVAL == 0:
+                logger.info("Telegram updates handled: %s", dict(update_stats))
+
+
 async def initialize_services(app: FastAPI):
     global pool, store, checkpointer
     logger.info("Background service initialization started...")
     try:
+        logger.info("Opening HTTP clients...")
+        http_clients.open()
+
+        logger.info("Loading tower data...")
+        load_tower_info()
+
         logger.info("Initializing LLM...")
         if settings.OPENAI_API_KEY:
             llm = ChatOpenAI(model=settings.MODEL)
@@ -376,11 +453,15 @@ async def initialize_services(app: FastAPI):
             logger.info("Opening Postgres connection pool...")
             pool = AsyncConnectionPool(
                 conninfo=settings.POSTGRES_CONN_STRING,
-                max_size=20,
+                min_size=settings.POSTGRES_POOL_MIN_SIZE,
+                max_size=settings.POSTGRES_POOL_MAX_SIZE,
+                max_lifetime=settings.POSTGRES_POOL_MAX_LIFETIME,
+                max_idle=settings.POSTGRES_POOL_MAX_IDLE,
+                check=AsyncConnectionPool.check_connection,
                 open=False,
                 kwargs=connection_kwargs,
             )
-            await pool.open()
+            await pool.open(wait=True, timeout=30)
             auth_service.set_database_pool(pool)
 
             logger.info("Setting up store and checkpointer...")
@@ -407,16 +488,27 @@ async def initialize_services(app: FastAPI):
         ai_service.connect(llm, store, checkpointer)
         logger.info("Connecting graph service...")
         await graph_service.connect()
+        logger.info("Warming up AI service...")
+        await ai_service.warm_up()
 
         logger.info("Initializing Telegram app...")
         tg_app = create_application()
         await tg_app.initialize()
 
+        logger.info(f"Starting {settings.TELEGRAM_WORKERS} Telegram update workers...")
+        update_queue = asyncio.Queue(maxsize=settings.TELEGRAM_QUEUE_SIZE)
+        update_workers = [
+            asyncio.create_task(telegram_update_worker(tg_app, update_queue))
+            for _ in range(settings.TELEGRAM_WORKERS)
+        ]
+
         logger.info("Setting app state...")
         app.state.ai_service = ai_service
         app.state.graph_service = graph_service
         app.state.auth_service = auth_service
         app.state.tg_app = tg_app
+        app.state.update_queue = update_queue
+        app.state.update_workers = update_workers
         logger.info("Background service initialization complete.")
     except Exception as e:
         logger.error(f"Background service initialization failed: {e}")
@@ -432,6 +524,34 @@ async def lifespan(app: FastAPI):
         yield
     finally:
         logger.info("Application shutdown sequence initiated...")
+        try:
+            update_queue = app.state.update_queue
+            if not update_queue.empty():
+                logger.info(f"Draining {update_queue.qsize()} queued Telegram updates...")
+            await asyncio.wait_for(
+                update_queue.join(), timeout=settings.TELEGRAM_DRAIN_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Dropping {app.state.update_queue.qsize()} Telegram updates still queued at shutdown"
+            )
+        except Exception as e:
+            logger.error(f"Error draining Telegram update queue: {e}")
+        try:
+            for worker in app.state.update_workers:
+                worker.cancel()
+            await asyncio.gather(*app.state.update_workers, return_exceptions=True)
+            logger.info(
+                "Telegram update workers stopped. Updates handled: %s",
+                dict(update_stats),
+            )
+        except Exception as e:
+            logger.error(f"Error stopping Telegram update workers: {e}")
+        try:
+            await ai_service.close()
+            logger.info("AI service stopped.")
+        except Exception as e:
+            logger.error(f"Error stopping AI service: {e}")
         try:
             if app.state.graph_service:
                 await app.state.graph_service.close()
@@ -444,6 +564,10 @@ async def lifespan(app: FastAPI):
                 logger.info("Telegram application shut down.")
         except Exception as e:
             logger.error(f"Error shutting down Telegram application: {e}")
+        try:
+            await http_clients.close()
+        except Exception as e:
+            logger.error(f"Error closing HTTP clients: {e}")
         try:
             if pool:
                 await pool.close()
@@ -1,11 +1,16 @@
-import json
+import copy
 import httpx
+import orjson
+import asyncio
 import logging
 
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Any, Awaitable, Callable, Hashable, Optional
 
 from langchain_core.tools import tool
+from graphiti_core.search.search import search
+from graphiti_core.search.search_config import SearchConfig, SearchResults
 from graphiti_core.search.search_filters import SearchFilters
 from graphiti_core.search.search_config_recipes import (
     COMBINED_HYBRID_SEARCH_MMR,
@@ -24,8 +29,10 @@ from graphiti_core.search.search_config_recipes import (
     COMMUNITY_HYBRID_SEARCH_MMR,
 )
 
+from app.core.cache import SemanticCache, SingleFlight, TTLCache
 from app.core.config import settings
-from app.services.graph import get_graphiti_client
+from app.core.http import http_clients
+from app.services.graph import graph_service
 from app.schemas.tools import (
     SearchInputSchema,
     NodeTypeEnum,
@@ -52,6 +59,81 @@ SEARCH_RECIPE_MAP = {
     SearchRecipeEnum.COMMUNITY_HYBRID_SEARCH_MMR: COMMUNITY_HYBRID_SEARCH_MMR,
 }
 
+# Graphiti only reads the search config, so the per-recipe templates are built
+# once with the tool's result limit and shared across calls.
+SEARCH_RESULT_LIMIT = 10
+_SEARCH_CONFIGS = {
+    recipe: config.model_copy(update={"limit": SEARCH_RESULT_LIMIT})
+    for recipe, config in SEARCH_RECIPE_MAP.items()
+}
+_DEFAULT_SEARCH_CONFIG = _SEARCH_CONFIGS[
+    SearchRecipeEnum.COMBINED_HYBRID_SEARCH_CROSS_ENCODER
+]
+
+
+def _rrf_prefilter_config(config: SearchConfig) -> Optional[SearchConfig]:
+    """Build the RRF variant of a cross-encoder recipe for shortlisting."""
+    update = {}
+    for field in ("edge_config", "node_config", "episode_config", "community_config"):
+        layer = getattr(config, field)
+        if layer is not None and layer.reranker.value == "cross_encoder":
+            update[field] = layer.model_copy(
+                update={"reranker": type(layer.reranker).rrf}
+            )
+    if not update:
+        return None
+    update["limit"] = settings.CROSS_ENCODER_CANDIDATES
+    return config.model_copy(update=update)
+
+
+# The cross-encoder makes one LLM call per passage, so cross-encoder recipes
+# first shortlist candidates with the cheap RRF fusion and only rerank those.
+# Graphiti already caps edges and episodes at the result limit, so only nodes
+# and communities get the wider CROSS_ENCODER_CANDIDATES shortlist.
+_PREFILTER_CONFIGS = {
+    recipe: prefilter
+    for recipe, config in _SEARCH_CONFIGS.items()
+    if (prefilter := _rrf_prefilter_config(config)) is not None
+}
+
+_connections_cache = SemanticCache(
+    maxsize=settings.SEMANTIC_CACHE_SIZE,
+    threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+)
+
+_TOWER_JSON_PATH = (
+    Path(__file__).resolve().parent.parent.parent / "static" / "data" / "tower.json"
+)
+_LUMA_EVENTS_URL = (
+    "/calendar/get-items?calendar_api_id=cal-Sl7q1nHTRXQzjP2&period=future"
+)
+_BERLINHOUSE_HEADERS = {
+    "X-API-Key": settings.BERLINHOUSE_API_KEY,
+    "Content-Type": "application/json",
+}
+
+_tower_info: Optional[str] = None
+
+_api_cache = TTLCache(maxsize=128, ttl=settings.TOOLS_CACHE_TTL)
+_api_inflight = SingleFlight()
+
+
+async def _cached_fetch(key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """Return a copy of the cached response for ``key``, fetching it on a miss.
+
+    Concurrent misses for the same key share a single upstream request.
+    """
+    result = _api_cache.get(key)
+    if result is None:
+        result = await _api_inflight.do(key, lambda: _fetch_and_store(key, fetch))
+    return copy.deepcopy(result)
+
+
+async def _fetch_and_store(key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    result = await fetch()
+    _api_cache.set(key, result)
+    return result
+
 
 @tool("get_calendar_events", parse_docstring=True)
 async def get_calendar_events():
@@ -64,12 +146,14 @@ async def get_calendar_events():
     Raises:
         Exception: If the Luma API is unavailable or returns an error.
     """
-    url = "https://api.lu.ma/calendar/get-items?calendar_api_id=cal-Sl7q1nHTRXQzjP2&period=future"
+    return await _cached_fetch("luma", _fetch_calendar_events)
+
+
+async def _fetch_calendar_events():
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.json()
+        response = await http_clients.luma.get(_LUMA_EVENTS_URL)
+        response.raise_for_status()
+        return orjson.loads(response.content)
     except httpx.HTTPStatusError as e:
         logger.error(
             f"Luma API HTTP error: {e.response.status_code} - {e.response.text}"
@@ -96,20 +180,22 @@ async def get_tower_communities(search: Optional[str] = None):
     Raises:
         Exception: If the BerlinHouse API is unavailable or returns an error.
     """
-    headers = {
-        "X-API-Key": settings.BERLINHOUSE_API_KEY,
-        "Content-Type": "application/json",
-    }
+    return await _cached_fetch(
+        ("communities", search), lambda: _fetch_tower_communities(search)
+    )
+
+
+async def _fetch_tower_communities(search: Optional[str]):
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            endpoint = settings.BERLINHOUSE_BASE_URL + "/communities/"
-            params = {}
-            if search:
-                params["search"] = search
-            response = await client.get(endpoint, headers=headers, params=params)
-            response.raise_for_status()
-            communities = response.json()
-            return communities
+        params = {}
+        if search:
+            params["search"] = search
+        response = await http_clients.berlinhouse.get(
+            "/communities/", headers=_BERLINHOUSE_HEADERS, params=params
+        )
+        response.raise_for_status()
+        communities = orjson.loads(response.content)
+        return communities
     except httpx.HTTPStatusError as e:
         logger.error(
             f"BerlinHouse communities API HTTP error: {e.response.status_code} - {e.response.text}"
@@ -141,22 +227,18 @@ async def create_supply_request(item: str, additional_info: Optional[str] = None
     Raises:
         Exception: If the BerlinHouse API is unavailable or returns an error.
     """
-    headers = {
-        "X-API-Key": settings.BERLINHOUSE_API_KEY,
-        "Content-Type": "application/json",
-    }
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            endpoint = settings.BERLINHOUSE_BASE_URL + "/supply-requests/"
-            data = {
-                "item": item,
-                "amount": 0,
-            }
-            if additional_info is not None:
-                data["additional_info"] = additional_info
-            response = await client.post(endpoint, headers=headers, json=data)
-            response.raise_for_status()
-            return response.json()
+        data = {
+            "item": item,
+            "amount": 0,
+        }
+        if additional_info is not None:
+            data["additional_info"] = additional_info
+        response = await http_clients.berlinhouse.post(
+            "/supply-requests/", headers=_BERLINHOUSE_HEADERS, json=data
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
     except httpx.HTTPStatusError as e:
         logger.error(
             f"BerlinHouse communities API HTTP error: {e.response.status_code} - {e.response.text}"
@@ -169,40 +251,45 @@ async def create_supply_request(item: str, additional_info: Optional[str] = None
         raise Exception(f"API Request Error: {e}") from e
 
 
+def load_tower_info() -> str:
+    """Parse tower.json once and keep it serialized for the agent."""
+    global _tower_info
+
+    try:
+        tower_data = orjson.loads(_TOWER_JSON_PATH.read_bytes())
+        logger.debug(f"Tower data loaded from {_TOWER_JSON_PATH}")
+    except FileNotFoundError:
+        logger.error(f"Tower data file not found: {_TOWER_JSON_PATH}")
+        raise
+    except orjson.JSONDecodeError as e:
+        logger.error(f"Invalid JSON in tower data file: {e}")
+        raise
+
+    _tower_info = orjson.dumps(tower_data).decode()
+    return _tower_info
+
+
 @tool("get_tower_info", parse_docstring=True)
-def get_tower_info():
+async def get_tower_info():
     """
     Retrieve detailed information about the Frontier Towner building.
 
-    This tool loads and returns the contents of 'tower.json', which contains comprehensive data about the building,
+    This tool returns the contents of 'tower.json', which contains comprehensive data about the building,
     including amenities, facilities, floor plans, and other relevant details. Use this tool to answer questions
     about the building's features, resources, or layout.
 
     Returns:
-        dict[str, Any]: A dictionary containing all available information about the Frontier Towner.
+        str: A JSON document containing all available information about the Frontier Towner.
     """
-    project_root = Path(__file__).resolve().parent.parent.parent
-    json_file_path = project_root / "static" / "data" / "tower.json"
-
-    try:
-        with open(json_file_path, "r", encoding="utf-8") as f:
-            tower_data = json.load(f)
-        logger.debug(f"Tower data loaded from {json_file_path}")
-        return tower_data
-    except FileNotFoundError:
-        logger.error(f"Tower data file not found: {json_file_path}")
-        raise
-    except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in tower data file: {e}")
-        raise
+    return _tower_info or load_tower_info()
 
 
 @tool("get_connections", args_schema=SearchInputSchema)
 async def get_connections(
     query: str,
     recipe: Optional[SearchRecipeEnum] = None,
-    edge_types: Optional[List[Union[str, EdgeTypeEnum]]] = None,
-    node_labels: Optional[List[Union[str, NodeTypeEnum]]] = None,
+    edge_types: Optional[tuple[EdgeTypeEnum, ...]] = None,
+    node_labels: Optional[tuple[NodeTypeEnum, ...]] = None,
 ):
     """
     Searches the graph for connection opportunities based on a query, leveraging message context.
@@ -210,26 +297,123 @@ async def get_connections(
     Uses combined hybrid search with cross-encoder by default to capture context from messages
     and episodes, providing better hit rates for finding relevant connections between people.
     """
-    graphiti = get_graphiti_client()
+    if not query.strip():
+        return SearchResults()
 
-    if recipe and recipe in SEARCH_RECIPE_MAP:
-        search_config = SEARCH_RECIPE_MAP[recipe].model_copy(deep=True)
-    else:
-        search_config = COMBINED_HYBRID_SEARCH_CROSS_ENCODER.model_copy(deep=True)
+    graphiti = graph_service.graphiti
 
-    search_config.limit = 10
-    search_filter = None
+    recipe = recipe or SearchRecipeEnum.COMBINED_HYBRID_SEARCH_CROSS_ENCODER
+    filter_key = (node_labels or (), edge_types or ())
+    search_filter = _search_filter(*filter_key) if any(filter_key) else None
 
-    if node_labels or edge_types:
-        search_filter = SearchFilters(
-            node_labels=node_labels or [],
-            edge_types=edge_types or [],
+    # Embed once up front so near-duplicate queries can be answered from the
+    # semantic cache and misses reuse the same vector for the graph search.
+    query_vector = await graphiti.embedder.create(
+        input_data=[query.replace("\n", " ")]
+    )
+    cache_key = (recipe, filter_key)
+    version = graph_service.version
+
+    results = _connections_cache.get(query_vector, cache_key, version)
+    if results is None:
+        results = await _search_graph(
+            graphiti, query, query_vector, recipe, search_filter or SearchFilters()
         )
+        _connections_cache.set(query_vector, cache_key, results, version)
+
+    return results
 
-    return await graphiti.search_(
-        query=query, config=search_config, search_filter=search_filter
+
+async def _search_graph(
+    graphiti,
+    query: str,
+    query_vector: list[float],
+    recipe: SearchRecipeEnum,
+    search_filter: SearchFilters,
+) -> SearchResults:
+    search_config = _SEARCH_CONFIGS.get(recipe, _DEFAULT_SEARCH_CONFIG)
+    prefilter_config = _PREFILTER_CONFIGS.get(recipe)
+
+    if prefilter_config is None:
+        return await search(
+            graphiti.clients,
+            query,
+            None,
+            search_config,
+            search_filter,
+            query_vector=query_vector,
+        )
+
+    candidates = await search(
+        graphiti.clients,
+        query,
+        None,
+        prefilter_config,
+        search_filter,
+        query_vector=query_vector,
     )
 
+    def rerank(items, text_of):
+        return _cross_encoder_rerank(
+            graphiti.cross_encoder,
+            query,
+            items,
+            text_of,
+            search_config.limit,
+            search_config.reranker_min_score,
+        )
+
+    (
+        (edges, edge_scores),
+        (nodes, node_scores),
+        (episodes, episode_scores),
+        (communities, community_scores),
+    ) = await asyncio.gather(
+        rerank(candidates.edges[: search_config.limit], lambda edge: edge.fact),
+        rerank(candidates.nodes, lambda node: node.name),
+        rerank(
+            candidates.episodes[: search_config.limit],
+            lambda episode: episode.content,
+        ),
+        rerank(candidates.communities, lambda community: community.name),
+    )
+
+    return SearchResults(
+        edges=edges,
+        edge_reranker_scores=edge_scores,
+        nodes=nodes,
+        node_reranker_scores=node_scores,
+        episodes=episodes,
+        episode_reranker_scores=episode_scores,
+        communities=communities,
+        community_reranker_scores=community_scores,
+    )
+
+
+async def _cross_encoder_rerank(
+    cross_encoder,
+    query: str,
+    items: list,
+    text_of: Callable[[Any], str],
+    limit: int,
+    min_score: float,
+) -> tuple[list, list[float]]:
+    if not items:
+        return [], []
+
+    items_by_text = {}
+    for item in items:
+        items_by_text.setdefault(text_of(item), item)
+
+    ranked = await cross_encoder.rank(query, list(items_by_text))
+    ranked = [(text, score) for text, score in ranked if score >= min_score][:limit]
+    return [items_by_text[text] for text, _ in ranked], [score for _, score in ranked]
+
+
+@lru_cache(maxsize=256)
+def _search_filter(node_labels: tuple, edge_types: tuple) -> SearchFilters:
+    return SearchFilters(node_labels=list(node_labels), edge_types=list(edge_types))
+
 
 def get_qa_agent_tools():
     tools = [
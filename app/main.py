@@ -1,14 +1,18 @@
+import re
 import httpx
+import orjson
+import asyncio
 import logging
 import sentry_sdk
 from typing import Optional
 
-from telegram import Update
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
-from fastapi import FastAPI, Request, BackgroundTasks, Query
+from fastapi.responses import ORJSONResponse, RedirectResponse, Response
+from fastapi import FastAPI, Request, Query
 
 from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.http import http_clients
 from app.core.lifespan import lifespan
 from app.services.auth import auth_service
 
@@ -33,41 +37,78 @@ if settings.SENTRY_DNS and settings.APP_ENV == "prod":
         send_default_pii=True,
     )
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+BOT_URL = f"https://t.me/{settings.BOT_HANDLE}"
+TOKEN_PATH = "/o/token/"
+TOKEN_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+OAUTH_TOKEN_DATA = {
+    "grant_type": "authorization_code",
+    "redirect_uri": f"{settings.WEBHOOK_URL}/auth/callback",
+    "client_id": settings.OAUTH_CLIENT_ID,
+    "client_secret": settings.OAUTH_CLIENT_SECRET,
+}
+
+# Telegram redelivers updates it did not see acknowledged; remember recent ones.
+_seen_updates = TTLCache(maxsize=10_000, ttl=600)
+# Telegram serialises update_id as the first top-level key of every update.
+_UPDATE_ID_RE = re.compile(rb'"update_id"\s*:\s*(\d+)')
 
-async def process_telegram_update(tg_app, update_data):
-    try:
-        update = Update.de_json(data=update_data, bot=tg_app.bot)
-        logger.debug(f"Processing Telegram update {update.update_id}")
-        await tg_app.process_update(update)
-        logger.info(f"Finished processing Telegram update {update.update_id}")
-    except Exception as e:
-        logger.error(f"Failed to process Telegram update: {e}", exc_info=True)
+
+def _error_body(message: str) -> bytes:
+    return orjson.dumps({"status": "error", "message": message})
+
+
+SESSION_EXPIRED_ERROR = _error_body(
+    "Authentication session expired. Please try logging in again."
+)
+NETWORK_ERROR = _error_body("An unexpected network or SSL error occurred.")
+USER_INFO_ERROR = _error_body("Could not retrieve your user profile.")
+NO_ACCESS_TOKEN_ERROR = _error_body(
+    "Authentication failed: no access token in the provider's response."
+)
+HEALTH_OK = orjson.dumps({"status": "ok", "message": "TowerBot is running"})
+UPDATE_OK = orjson.dumps({"status": "ok"})
+
+
+def _json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/health")
-def check_health():
-    logger.info("Health check requested")
-    return {"status": "ok", "message": "TowerBot is running"}
+async def check_health():
+    return _json_response(HEALTH_OK)
 
 
 @app.post("/telegram")
-async def handle_telegram_update(request: Request, background_tasks: BackgroundTasks):
+async def handle_telegram_update(request: Request):
+    update_id = "unknown"
     try:
-        update_data = await request.json()
-        update_id = update_data.get("update_id", "unknown")
-        logger.info(
-            f"Telegram update {update_id} received, queueing for background processing"
+        # Full parsing happens in the update workers so the ack is not delayed.
+        raw_update = await request.body()
+        match = _UPDATE_ID_RE.search(raw_update)
+        if match:
+            update_id = int(match[1])
+            if update_id in _seen_updates:
+                logger.debug("Telegram update %s already queued, skipping", update_id)
+                return _json_response(UPDATE_OK)
+
+        logger.debug(
+            "Telegram update %s received, queueing for background processing", update_id
         )
 
-        tg_app = request.app.state.tg_app
-        background_tasks.add_task(process_telegram_update, tg_app, update_data)
-        return {"status": "ok"}
+        request.app.state.update_queue.put_nowait(raw_update)
+        if match:
+            _seen_updates.set(update_id, True)
+        return _json_response(UPDATE_OK)
+    except asyncio.QueueFull:
+        # Telegram redelivers updates that are not acknowledged with a 2xx.
+        logger.warning("Telegram update queue full, deferring update %s", update_id)
+        return ORJSONResponse({"status": "busy"}, status_code=503)
     except Exception as e:
-        logger.error(f"Failed to handle Telegram update webhook: {e}", exc_info=True)
+        logger.error("Failed to handle Telegram update webhook: %s", e, exc_info=True)
         return {"status": "error"}
 
 
@@ -79,7 +120,7 @@ async def handle_oauth_callback(
     error: Optional[str] = Query(None),
 ):
     if error:
-        logger.error(f"OAuth callback for user {state} failed with error: {error}")
+        logger.error("OAuth callback for user %s failed with error: %s", state, error)
         return {
             "status": "error",
             "message": "The authentication provider returned an error.",
@@ -88,41 +129,28 @@ async def handle_oauth_callback(
 
     telegram_id = int(state)
     access_token = None
-    code_verifier = await auth_service.get_pkce_verifier(telegram_id)
+    code_verifier = await auth_service.pop_pkce_verifier(telegram_id)
     if not code_verifier:
-        logger.error(f"Could not find PKCE code_verifier for user {telegram_id}.")
-        return {
-            "status": "error",
-            "message": "Authentication session expired. Please try logging in again.",
-        }
+        logger.error("Could not find PKCE code_verifier for user %s.", telegram_id)
+        return _json_response(SESSION_EXPIRED_ERROR)
 
-    data = {
-        "grant_type": "authorization_code",
-        "code": code,
-        "redirect_uri": f"{settings.WEBHOOK_URL}/auth/callback",
-        "client_id": settings.OAUTH_CLIENT_ID,
-        "client_secret": settings.OAUTH_CLIENT_SECRET,
-        "code_verifier": code_verifier,
-    }
-    token_url = f"{settings.BERLINHOUSE_BASE_URL}/o/token/"
+    data = OAUTH_TOKEN_DATA | {"code": code, "code_verifier": code_verifier}
 
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            token_response = await client.post(
-                token_url,
-                data=data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-            )
+        token_response = await http_clients.berlinhouse.post(
+            TOKEN_PATH, data=data, headers=TOKEN_HEADERS
+        )
 
-            token_response.raise_for_status()
-            token_data = token_response.json()
-            access_token = token_data.get("accessToken") or token_data.get(
-                "access_token"
-            )
+        token_response.raise_for_status()
+        token_data = token_response.json()
+        access_token = token_data.get("accessToken") or token_data.get("access_token")
 
     except httpx.HTTPStatusError as e:
         logger.error(
-            f"Token exchange failed for user {telegram_id}: {e.response.status_code} - {e.response.text}"
+            "Token exchange failed for user %s: %s - %s",
+            telegram_id,
+            e.response.status_code,
+            e.response.text,
         )
         return {
             "status": "error",
@@ -131,41 +159,35 @@ async def handle_oauth_callback(
         }
     except Exception as e:
         logger.error(
-            f"An unexpected error occurred during token exchange for user {telegram_id}: {e}",
+            "An unexpected error occurred during token exchange for user %s: %s",
+            telegram_id,
+            e,
             exc_info=True,
         )
-        return {
-            "status": "error",
-            "message": "An unexpected network or SSL error occurred.",
-        }
+        return _json_response(NETWORK_ERROR)
 
     if access_token:
-        logger.info(f"Successfully obtained access token for user {telegram_id}")
-        await auth_service.clear_pkce_verifier(telegram_id)
+        logger.info("Successfully obtained access token for user %s", telegram_id)
         user_info = await auth_service.get_user_info(access_token)
-        logger.info(f"User info: {user_info}")
+        logger.info("User info: %s", user_info)
         if user_info and ("id" in user_info or "sub" in user_info):
             user_id = user_info.get("id") or user_info.get("sub")
-            logger.info(f"Successfully fetched user info for user_id {user_id}")
+            logger.info("Successfully fetched user info for user_id %s", user_id)
             await auth_service.save_user_session(
                 user_id=user_id,
                 telegram_id=telegram_id,
                 access_token=access_token,
             )
-            return RedirectResponse(f"https://t.me/{settings.BOT_HANDLE}")
+            return RedirectResponse(BOT_URL)
         else:
             logger.error(
-                f"Failed to get user info for user {telegram_id} after successful token exchange."
+                "Failed to get user info for user %s after successful token exchange.",
+                telegram_id,
             )
-            return {
-                "status": "error",
-                "message": "Could not retrieve your user profile.",
-            }
+            return _json_response(USER_INFO_ERROR)
     else:
         logger.error(
-            f"Token exchange for user {telegram_id} was successful but no access_token was returned."
+            "Token exchange for user %s was successful but no access_token was returned.",
+            telegram_id,
         )
-        return {
-            "status": "error",
-            "message": "Authentication failed: no access token in the provider's response.",
-        }
+        return _json_response(NO_ACCESS_TOKEN_ERROR)
@@ -1,6 +1,7 @@
-from enum import Enum
+from enum import StrEnum
+from typing import Literal
 
-class NodeTypeEnum(str, Enum):
+class NodeTypeEnum(StrEnum):
     Event = "Event"
     Floor = "Floor"
     Interest = "Interest"
@@ -9,7 +10,9 @@ class NodeTypeEnum(str, Enum):
     Topic = "Topic"
     User = "User"
 
-class EdgeTypeEnum(str, Enum):
+NodeTypeLiteral = Literal["Event", "Floor", "Interest", "Message", "Project", "Topic", "User"]
+
+class EdgeTypeEnum(StrEnum):
     Attends = "ATTENDS"
     InterestedIn = "INTERESTED_IN"
     InReplyTo = "IN_REPLY_TO"
@@ -20,15 +23,15 @@ class EdgeTypeEnum(str, Enum):
     WorksOn = "WORKS_ON"
 
 EDGE_TYPE_MAP = {
-    ("Event", "Floor"): ["LOCATED_ON"],
-    ("Event", "Interest"): ["RELATED_TO"],
-    ("Message", "Message"): ["IN_REPLY_TO"],
-    ("Message", "Topic"): ["SENT_IN"],
-    ("Project", "Floor"): ["LOCATED_ON"],
-    ("Project", "Interest"): ["RELATED_TO"],
-    ("User", "Event"): ["ATTENDS"],
-    ("User", "Floor"): ["LOCATED_ON"],
-    ("User", "Interest"): ["INTERESTED_IN"],
-    ("User", "Message"): ["SENT"],
-    ("User", "Project"): ["WORKS_ON"],
+    ("Event", "Floor"): ("LOCATED_ON",),
+    ("Event", "Interest"): ("RELATED_TO",),
+    ("Message", "Message"): ("IN_REPLY_TO",),
+    ("Message", "Topic"): ("SENT_IN",),
+    ("Project", "Floor"): ("LOCATED_ON",),
+    ("Project", "Interest"): ("RELATED_TO",),
+    ("User", "Event"): ("ATTENDS",),
+    ("User", "Floor"): ("LOCATED_ON",),
+    ("User", "Interest"): ("INTERESTED_IN",),
+    ("User", "Message"): ("SENT",),
+    ("User", "Project"): ("WORKS_ON",),
 }
@@ -1,8 +1,14 @@
-from typing import Optional, List
-from pydantic import BaseModel, Field
+from typing import ClassVar, Optional, List
+from pydantic import BaseModel, ConfigDict, Field
 
 
-class User(BaseModel):
+class OntologyModel(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+
+class User(OntologyModel):
+    label: ClassVar[str] = "User"
+
     user_id: int = Field(..., description="Unique integer ID for the user.")
     username: Optional[str] = Field(
         None, description="The user's username, if available."
@@ -12,30 +18,27 @@ class User(BaseModel):
         None, description="The user's last name, if available."
     )
 
-    class Config:
-        label = "User"
 
+class Topic(OntologyModel):
+    label: ClassVar[str] = "Topic"
 
-class Topic(BaseModel):
     topic_id: int = Field(..., description="Unique integer ID for the topic.")
     title: str = Field(..., description="Title of the topic or thread.")
 
-    class Config:
-        label = "Topic"
 
+class Message(OntologyModel):
+    label: ClassVar[str] = "Message"
 
-class Message(BaseModel):
     message_id: int = Field(..., description="Unique integer ID for the message.")
     text: Optional[str] = Field(None, description="Text content of the message.")
     timestamp: str = Field(
         ..., description="ISO 8601 timestamp when the message was sent."
     )
 
-    class Config:
-        label = "Message"
 
+class Floor(OntologyModel):
+    label: ClassVar[str] = "Floor"
 
-class Floor(BaseModel):
     level: int = Field(..., description="Numeric floor level, e.g., 9 for ninth floor.")
     description: Optional[str] = Field(
         None, description="Description of the floor, e.g., 'Artificial Intelligence'."
@@ -44,11 +47,10 @@ class Floor(BaseModel):
         None, description="List of facilities available on this floor."
     )
 
-    class Config:
-        label = "Floor"
 
+class Event(OntologyModel):
+    label: ClassVar[str] = "Event"
 
-class Event(BaseModel):
     luma_id: Optional[str] = Field(None, description="Luma ID of the event.")
     url: Optional[str] = Field(None, description="URL of the event.")
     start_at: Optional[str] = Field(
@@ -64,48 +66,44 @@ class Event(BaseModel):
         description="Current status, e.g., 'Scheduled', 'Completed', 'Cancelled'.",
     )
 
-    class Config:
-        label = "Event"
 
+class Interest(OntologyModel):
+    label: ClassVar[str] = "Interest"
 
-class Interest(BaseModel):
     title: str = Field(..., description="Title of the interest.")
 
-    class Config:
-        label = "Interest"
 
+class Project(OntologyModel):
+    label: ClassVar[str] = "Project"
 
-class Project(BaseModel):
     status: Optional[str] = Field(
         "Active", description="The current status, e.g., 'Active', 'Archived'."
     )
 
-    class Config:
-        label = "Project"
 
+class Sent(OntologyModel):
+    label: ClassVar[str] = "SENT"
+    source_types: ClassVar[List[str]] = ["User"]
+    target_types: ClassVar[List[str]] = ["Message"]
 
-class Sent(BaseModel):
-    class Config:
-        label = "SENT"
-        source_types = ["User"]
-        target_types = ["Message"]
 
+class SentIn(OntologyModel):
+    label: ClassVar[str] = "SENT_IN"
+    source_types: ClassVar[List[str]] = ["Message"]
+    target_types: ClassVar[List[str]] = ["Topic"]
 
-class SentIn(BaseModel):
-    class Config:
-        label = "SENT_IN"
-        source_types = ["Message"]
-        target_types = ["Topic"]
 
+class InReplyTo(OntologyModel):
+    label: ClassVar[str] = "IN_REPLY_TO"
+    source_types: ClassVar[List[str]] = ["Message"]
+    target_types: ClassVar[List[str]] = ["Message"]
 
-class InReplyTo(BaseModel):
-    class Config:
-        label = "IN_REPLY_TO"
-        source_types = ["Message"]
-        target_types = ["Message"]
 
+class LocatedOn(OntologyModel):
+    label: ClassVar[str] = "LOCATED_ON"
+    source_types: ClassVar[List[str]] = ["User", "Event", "Project"]
+    target_types: ClassVar[List[str]] = ["Floor"]
 
-class LocatedOn(BaseModel):
     since: Optional[str] = Field(
         None, description="ISO 8601 timestamp since the entity has been located here."
     )
@@ -113,13 +111,12 @@ class LocatedOn(BaseModel):
         None, description="Additional location details, e.g., room number."
     )
 
-    class Config:
-        label = "LOCATED_ON"
-        source_types = ["User", "Event", "Project"]
-        target_types = ["Floor"]
 
+class WorksOn(OntologyModel):
+    label: ClassVar[str] = "WORKS_ON"
+    source_types: ClassVar[List[str]] = ["User"]
+    target_types: ClassVar[List[str]] = ["Project"]
 
-class WorksOn(BaseModel):
     role: Optional[str] = Field(
         None,
         description="Role of the user in the event or project, e.g., 'Speaker', 'Volunteer'.",
@@ -129,13 +126,12 @@ class WorksOn(BaseModel):
         description="ISO 8601 timestamp when the user was assigned to the event or project.",
     )
 
-    class Config:
-        label = "WORKS_ON"
-        source_types = ["User"]
-        target_types = ["Project"]
 
+class Attends(OntologyModel):
+    label: ClassVar[str] = "ATTENDS"
+    source_types: ClassVar[List[str]] = ["User"]
+    target_types: ClassVar[List[str]] = ["Event"]
 
-class Attends(BaseModel):
     rsvp_status: Optional[str] = Field(
         None, description="RSVP status, e.g., 'Attending', 'Interested', 'Declined'."
     )
@@ -143,29 +139,22 @@ class Attends(BaseModel):
         None, description="ISO 8601 timestamp when the user checked in."
     )
 
-    class Config:
-        label = "ATTENDS"
-        source_types = ["User"]
-        target_types = ["Event"]
 
+class InterestedIn(OntologyModel):
+    label: ClassVar[str] = "INTERESTED_IN"
+    source_types: ClassVar[List[str]] = ["User"]
+    target_types: ClassVar[List[str]] = ["Interest"]
 
-class InterestedIn(BaseModel):
     expressed_at: Optional[str] = Field(
         None, description="ISO 8601 timestamp when the interest was expressed."
     )
 
-    class Config:
-        label = "INTERESTED_IN"
-        source_types = ["User"]
-        target_types = ["Interest"]
 
+class RelatedTo(OntologyModel):
+    label: ClassVar[str] = "RELATED_TO"
+    source_types: ClassVar[List[str]] = ["Project", "Event"]
+    target_types: ClassVar[List[str]] = ["Interest"]
 
-class RelatedTo(BaseModel):
     relationship_type: Optional[str] = Field(
         None, description="Type of relationship, e.g., 'technology', 'domain', 'topic'"
     )
-
-    class Config:
-        label = "RELATED_TO"
-        source_types = ["Project", "Event"]
-        target_types = ["Interest"]
@@ -1,16 +1,16 @@
-from enum import Enum
-from pydantic import BaseModel, Field
+from enum import StrEnum
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Literal
 
-from app.schemas.generated_enums import NodeTypeEnum
+from app.schemas.generated_enums import NodeTypeLiteral
 
 
-class SourceType(str, Enum):
+class SourceType(StrEnum):
     NOTION_KNOWLEDGE_BASE = "Notion Knowledge Base"
     VECTOR_DATABASE = "Vector Database"
 
 
-class ToolUsed(str, Enum):
+class ToolUsed(StrEnum):
     NOTION_SEARCH = "Notion Search"
     VECTOR_SEARCH = "Vector Search"
 
@@ -24,7 +24,7 @@ class ConnectionCandidate(BaseModel):
         ...,
         description="Human‑readable name or title of the node.",
     )
-    node_label: NodeTypeEnum = Field(
+    node_label: NodeTypeLiteral = Field(
         ...,
         description="The node’s label/type in the knowledge graph (e.g., 'User', 'Community').",
     )
@@ -37,6 +37,8 @@ class ConnectionCandidate(BaseModel):
 
 
 class QuestionResponse(BaseModel):
+    model_config = ConfigDict(use_enum_values=True, validate_by_name=True)
+
     answer: str = Field(
         ...,
         description="The final, synthesized answer to the user's query.",
@@ -72,13 +74,11 @@ class QuestionResponse(BaseModel):
         ...,
         description="The specific tool used to fetch the information.",
     )
-    model_config = {
-        "use_enum_values": True,
-        "validate_by_name": True,
-    }
 
 
 class ConnectionResponse(BaseModel):
+    model_config = ConfigDict(use_enum_values=True, validate_by_name=True)
+
     answer: str = Field(
         ...,
         description="Short, synthesized explanation of who the user should connect with and why.",
@@ -104,8 +104,3 @@ class ConnectionResponse(BaseModel):
         "get_connections",
         description="Tool invoked to produce this response.",
     )
-
-    model_config = {
-        "validate_by_name": True,
-        "use_enum_values": True,
-    }
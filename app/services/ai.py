@@ -1,33 +1,104 @@
-import uuid
+import time
+import string
+import hashlib
+import secrets
+import asyncio
 import logging
+import weakref
 
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from datetime import datetime
 
 from langsmith import Client
 from langgraph.prebuilt import create_react_agent
+from langchain_core.tools import BaseTool
+from langchain_core.messages import AIMessageChunk, HumanMessage, SystemMessage
 from langchain_core.language_models import BaseChatModel
 from langgraph.store.postgres.base import BasePostgresStore
 from langgraph.checkpoint.postgres.base import BasePostgresSaver
 from langchain.agents import create_tool_calling_agent, AgentExecutor
 from langmem import create_manage_memory_tool, create_search_memory_tool
 
+from app.core.cache import SingleFlight, TTLCache
+from app.core.config import settings
 from app.core.tools import (
     get_qa_agent_tools,
     get_connect_agent_tools,
     get_request_agent_tools,
 )
+from app.services.graph import graph_service
 
 logger = logging.getLogger(__name__)
 
+SESSION_CACHE_SIZE = 10_000
+SESSION_TTL = 24 * 60 * 60
+PENDING_COMMAND_CACHE_SIZE = 10_000
+PENDING_COMMAND_TTL = 10 * 60
+REAP_INTERVAL = 60
+# /request files supply requests, so only read-only commands are cached.
+CACHEABLE_COMMANDS = frozenset({"ask", "connect"})
+RESPONSE_CACHE_SIZE = 10_000
+RESPONSE_CACHE_TTL = 5 * 60
+STREAM_HOLDBACK_CHARS = 200
+
+
+def _split_template(template: str, field: str) -> Tuple[str, ...]:
+    """Split a str.format template into the literal text around each ``{field}``.
+
+    Joining the result with a value renders the template without re-parsing it.
+    """
+    segments, literal = [], ""
+    for text, name, spec, conversion in string.Formatter().parse(template):
+        literal += text
+        if name is None:
+            continue
+        if name != field or spec or conversion:
+            raise ValueError(f"Unsupported placeholder {{{name}}} in prompt template")
+        segments.append(literal)
+        literal = ""
+    segments.append(literal)
+    return tuple(segments)
+
 
 class AiService:
     def __init__(self):
         self.bot = None
-        self.client = Client()
+        self._client: Optional[Client] = None
         self.llm: Optional[BaseChatModel] = None
-        self.user_sessions: Dict[str, Dict[str, Any]] = {}
-        self.pending_commands: Dict[int, Dict[str, Any]] = {}
+        self.user_sessions = TTLCache(maxsize=SESSION_CACHE_SIZE, ttl=SESSION_TTL)
+        self.pending_commands = TTLCache(
+            maxsize=PENDING_COMMAND_CACHE_SIZE, ttl=PENDING_COMMAND_TTL
+        )
+        self._reaper: Optional[asyncio.Task] = None
+        self._response_cache = TTLCache(
+            maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL
+        )
+        self._response_inflight = SingleFlight()
+        self._command_handlers = {
+            "ask": self.handle_ask,
+            "connect": self.handle_connect,
+            "request": self.handle_request,
+        }
+        self._prompt_cache = TTLCache(maxsize=16, ttl=settings.PROMPT_CACHE_TTL)
+        self._prompt_inflight = SingleFlight()
+        self._ask_tools: Tuple[BaseTool, ...] = ()
+        self._connect_tools: Tuple[BaseTool, ...] = ()
+        self._request_tools: Tuple[BaseTool, ...] = ()
+        self._executors: Dict[str, Tuple[Any, AgentExecutor]] = {}
+        self._general_prompt: Any = None
+        self._general_template: Tuple[str, ...] = ("",)
+        self._time_cache: Tuple[int, str] = (-1, "")
+        # Entries disappear once no agent() call holds the lock any more.
+        self._thread_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+
+    @property
+    def client(self) -> Client:
+        # Built on first prompt pull rather than when the module is imported.
+        if self._client is None:
+            self._client = Client()
+        return self._client
 
     def connect(
         self,
@@ -36,12 +107,16 @@ class AiService:
         checkpointer: BasePostgresSaver,
     ):
         self.llm = llm
+        self._ask_tools = tuple(get_qa_agent_tools())
+        self._connect_tools = tuple(get_connect_agent_tools())
+        self._request_tools = tuple(get_request_agent_tools())
+        self._executors.clear()
         self.bot = create_react_agent(
             name="General",
             model=self.llm,
             tools=[
-                *get_qa_agent_tools(),
-                *get_connect_agent_tools(),
+                *self._ask_tools,
+                *self._connect_tools,
                 create_manage_memory_tool(
                     namespace=("memories", "{user_id}"), store=store
                 ),
@@ -52,72 +127,136 @@ class AiService:
             store=store,
             checkpointer=checkpointer,
         )
+        if self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap_expired())
+
+    async def warm_up(self):
+        """Pull prompts and build the command executors before the first message."""
+        results = await asyncio.gather(
+            self._get_executor("Ask", "totaylor/towerbot-ask", self._ask_tools),
+            self._get_executor(
+                "Connect", "totaylor/towerbot-connect", self._connect_tools
+            ),
+            self._get_executor(
+                "Request", "totaylor/towerbot-request", self._request_tools
+            ),
+            self._get_general_template(),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"AI service warm-up step failed: {result}")
+
+    async def close(self):
+        if self._reaper is not None:
+            self._reaper.cancel()
+            try:
+                await self._reaper
+            except asyncio.CancelledError:
+                pass
+            self._reaper = None
+
+    async def _reap_expired(self):
+        # Expired entries are otherwise only dropped when the same key is read.
+        while True:
+            await asyncio.sleep(REAP_INTERVAL)
+            self.user_sessions.purge_expired()
+            self.pending_commands.purge_expired()
+            self._response_cache.purge_expired()
+
+    async def _get_prompt(self, name: str):
+        prompt = self._prompt_cache.get(name)
+        if prompt is None:
+            prompt = await self._prompt_inflight.do(
+                name, lambda: self._pull_prompt(name)
+            )
+        return prompt
+
+    async def _pull_prompt(self, name: str):
+        # pull_prompt is a blocking HTTP call; keep it off the event loop.
+        prompt = await asyncio.to_thread(self.client.pull_prompt, name)
+        self._prompt_cache.set(name, prompt)
+        return prompt
+
+    async def _get_executor(
+        self, name: str, prompt_name: str, tools: Tuple[BaseTool, ...]
+    ) -> AgentExecutor:
+        prompt = await self._get_prompt(prompt_name)
+        # Rebuild only when the prompt cache hands back a freshly pulled prompt.
+        cached = self._executors.get(name)
+        if cached is not None and cached[0] is prompt:
+            return cached[1]
 
-    def _get_or_create_session(self, user_id: int, command: str):
-        session_key = f"{user_id}_{command}"
+        agent = create_tool_calling_agent(self.llm, tools, prompt)
+        executor = AgentExecutor(name=name, agent=agent, tools=tools)
+        self._executors[name] = (prompt, executor)
+        return executor
+
+    async def _get_general_template(self) -> Tuple[str, ...]:
+        prompt = await self._get_prompt("totaylor/towerbot-general")
+        if prompt is not self._general_prompt:
+            self._general_template = _split_template(
+                prompt.messages[0].prompt.template, "system_time"
+            )
+            self._general_prompt = prompt
+        return self._general_template
+
+    def _now_iso(self) -> str:
+        # Minute precision keeps prompts byte-identical within a minute so the
+        # provider's prefix cache can reuse them.
+        minute = int(time.time() // 60)
+        if minute != self._time_cache[0]:
+            self._time_cache = (minute, datetime.now().isoformat(timespec="minutes"))
+        return self._time_cache[1]
 
-        if session_key in self.user_sessions:
-            session_time = self.user_sessions[session_key]["created_at"]
-            if datetime.now() - session_time < timedelta(hours=24):
-                return self.user_sessions[session_key]["thread_id"]
+    def _get_or_create_session(self, user_id: int, command: str):
+        session_key = (user_id, command)
 
-        thread_id = f"{user_id}_{command}_{uuid.uuid4().hex[:8]}"
-        self.user_sessions[session_key] = {
-            "thread_id": thread_id,
-            "created_at": datetime.now(),
-        }
+        thread_id = self.user_sessions.get(session_key)
+        if thread_id is None:
+            thread_id = f"{user_id}_{command}_{secrets.token_hex(4)}"
+            self.user_sessions.set(session_key, thread_id)
         return thread_id
 
     async def handle_ask(self, message: str):
-        tools = get_qa_agent_tools()
-        prompt = self.client.pull_prompt("totaylor/towerbot-ask")
-
-        agent = create_tool_calling_agent(self.llm, tools, prompt)
-        agent_executor = AgentExecutor(name="Ask", agent=agent, tools=tools)
+        agent_executor = await self._get_executor(
+            "Ask", "totaylor/towerbot-ask", self._ask_tools
+        )
 
         response = await agent_executor.ainvoke(
-            {"input": message, "chat_history": [], "system_time": datetime.now()}
+            {"input": message, "chat_history": [], "system_time": self._now_iso()}
         )
 
         return response.get("output")
 
     async def handle_connect(self, message: str):
-        tools = get_connect_agent_tools()
-        prompt = self.client.pull_prompt("totaylor/towerbot-connect")
-
-        agent = create_tool_calling_agent(self.llm, tools, prompt)
-        agent_executor = AgentExecutor(name="Connect", agent=agent, tools=tools)
+        agent_executor = await self._get_executor(
+            "Connect", "totaylor/towerbot-connect", self._connect_tools
+        )
 
         response = await agent_executor.ainvoke(
-            {"input": message, "chat_history": [], "system_time": datetime.now()}
+            {"input": message, "chat_history": [], "system_time": self._now_iso()}
         )
 
         return response.get("output")
 
     async def handle_request(self, message: str):
-        tools = get_request_agent_tools()
-        prompt = self.client.pull_prompt("totaylor/towerbot-request")
-
-        agent = create_tool_calling_agent(self.llm, tools, prompt)
-        agent_executor = AgentExecutor(name="Request", agent=agent, tools=tools)
+        agent_executor = await self._get_executor(
+            "Request", "totaylor/towerbot-request", self._request_tools
+        )
 
         response = await agent_executor.ainvoke(
-            {"input": message, "chat_history": [], "system_time": datetime.now()}
+            {"input": message, "chat_history": [], "system_time": self._now_iso()}
         )
 
         return response.get("output")
 
-    async def agent(self, message: str, user_id: int):
-        prompt = self.client.pull_prompt("totaylor/towerbot-general")
+    async def _agent_call(self, message: str, user_id: int):
+        template = await self._get_general_template()
 
         messages = [
-            {
-                "role": "system",
-                "content": prompt.messages[0].prompt.template.format(
-                    system_time=datetime.now()
-                ),
-            },
-            {"role": "user", "content": message},
+            SystemMessage(content=self._now_iso().join(template)),
+            HumanMessage(content=message),
         ]
 
         thread_id = self._get_or_create_session(user_id, "direct")
@@ -127,34 +266,57 @@ class AiService:
             "configurable": {"user_id": str(user_id), "thread_id": thread_id},
         }
 
-        response = await self.bot.ainvoke({"messages": messages}, config=config)
-
-        return response["messages"][-1].content
+        lock = self._thread_locks.get(thread_id)
+        if lock is None:
+            lock = self._thread_locks[thread_id] = asyncio.Lock()
+
+        return {"messages": messages}, config, lock
+
+    async def agent_stream(self, message: str, user_id: int) -> AsyncIterator[str]:
+        """Yield the reply generated so far each time the general agent emits tokens."""
+        agent_input, config, lock = await self._agent_call(message, user_id)
+
+        # Serialize turns on one thread so each sees the previous checkpoint.
+        async with lock:
+            reply_id, text, calls_tools = None, "", False
+            async for chunk, metadata in self.bot.astream(
+                agent_input, config=config, stream_mode="messages"
+            ):
+                if metadata.get("langgraph_node") != "agent":
+                    continue
+                if not isinstance(chunk, AIMessageChunk):
+                    continue
+                # Each model turn starts a new message; only the last one is the reply.
+                if chunk.id != reply_id:
+                    reply_id, text, calls_tools = chunk.id, "", False
+                # Turns that call tools are intermediate steps, not the answer.
+                if chunk.tool_call_chunks:
+                    calls_tools = True
+                if calls_tools:
+                    continue
+                if not isinstance(chunk.content, str) or not chunk.content:
+                    continue
+                text += chunk.content
+                # A "Let me check..." lead-in before a tool call is short, so
+                # only stream once the turn is clearly more than that.
+                if len(text) >= STREAM_HOLDBACK_CHARS:
+                    yield text
+
+            # A short final answer never crossed the threshold; send it whole.
+            if text and not calls_tools and len(text) < STREAM_HOLDBACK_CHARS:
+                yield text
 
     def set_pending_command(self, user_id: int, command: str):
         """Set a pending command for a user"""
-        self.pending_commands[user_id] = {
-            "command": command,
-            "created_at": datetime.now(),
-        }
+        self.pending_commands.set(user_id, command)
 
     def get_pending_command(self, user_id: int) -> Optional[str]:
-        """Get pending command for user, clearing expired ones"""
-        if user_id not in self.pending_commands:
-            return None
-        
-        pending = self.pending_commands[user_id]
-        # Clear if older than 10 minutes
-        if datetime.now() - pending["created_at"] > timedelta(minutes=10):
-            del self.pending_commands[user_id]
-            return None
-        
-        return pending["command"]
+        """Get pending command for user; expired ones are dropped after 10 minutes"""
+        return self.pending_commands.get(user_id)
 
     def clear_pending_command(self, user_id: int):
         """Clear pending command for user"""
-        if user_id in self.pending_commands:
-            del self.pending_commands[user_id]
+        self.pending_commands.pop(user_id)
 
     async def handle_pending_command(self, user_id: int, message: str):
         """Handle a message when user has a pending command"""
@@ -166,14 +328,27 @@ class AiService:
         self.clear_pending_command(user_id)
         
         # Process the message as if it was the original command with context
-        if command == "ask":
-            return await self.handle_ask(message)
-        elif command == "connect":
-            return await self.handle_connect(message)
-        elif command == "request":
-            return await self.handle_request(message)
-        
-        return None
+        return await self.run_command(command, message)
+
+    async def run_command(self, command: str, message: str) -> Optional[str]:
+        """Run a slash command's agent; unknown commands return None"""
+        handler = self._command_handlers.get(command)
+        if handler is None:
+            return None
+        if command not in CACHEABLE_COMMANDS:
+            return await handler(message)
+
+        key = (command, hashlib.sha256(message.encode()).digest())
+        if command == "connect":
+            # Connections come from the graph, so new episodes invalidate them.
+            key += (graph_service.version,)
+
+        response = self._response_cache.get(key)
+        if response is None:
+            response = await self._response_inflight.do(key, lambda: handler(message))
+            if response:
+                self._response_cache.set(key, response)
+        return response
 
 
 ai_service = AiService()
@@ -1,18 +1,50 @@
 import logging
 from typing import Optional
-import httpx
 
-from psycopg.rows import dict_row
+from psycopg.rows import tuple_row
 from psycopg_pool import AsyncConnectionPool
 from fastapi import HTTPException, Security, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
-from app.core.config import settings
+from app.core.http import http_clients
 
 logger = logging.getLogger(__name__)
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
+# Kept as module constants so each query text is identical on every call and
+# psycopg can reuse its server-side prepared statement (POSTGRES_PREPARE_THRESHOLD).
+SQL_UPSERT_VERIFIER = """
+    INSERT INTO sessions (telegram_id, code_verifier)
+    VALUES (%s, %s)
+    ON CONFLICT (telegram_id)
+    DO UPDATE SET code_verifier = EXCLUDED.code_verifier
+"""
+SQL_POP_VERIFIER = """
+    UPDATE sessions AS s
+    SET code_verifier = NULL
+    FROM (
+        SELECT telegram_id, code_verifier FROM sessions
+        WHERE telegram_id = %s
+        FOR UPDATE
+    ) AS old
+    WHERE s.telegram_id = old.telegram_id
+    AND old.code_verifier IS NOT NULL
+    RETURNING old.code_verifier
+"""
+SQL_CHECK_SESSION = """
+    SELECT 1 FROM sessions
+    WHERE telegram_id = %s
+    AND access_token IS NOT NULL
+    AND (expires_at IS NULL OR expires_at > NOW())
+    LIMIT 1
+"""
+SQL_SAVE_SESSION = """
+    UPDATE sessions
+    SET user_id = %s, access_token = %s
+    WHERE telegram_id = %s
+"""
+
 
 class AuthService:
     def __init__(self):
@@ -38,16 +70,10 @@ class AuthService:
             return False
         try:
             async with self._pool.connection() as conn:
-                async with conn.cursor() as cursor:
-                    await cursor.execute(
-                        """
-                        INSERT INTO sessions (telegram_id, code_verifier)
-                        VALUES (%s, %s)
-                        ON CONFLICT (telegram_id)
-                        DO UPDATE SET code_verifier = EXCLUDED.code_verifier
-                        """,
-                        (telegram_id, code_verifier),
-                    )
+                await conn.execute(
+                    SQL_UPSERT_VERIFIER,
+                    (telegram_id, code_verifier),
+                )
             logger.info(f"Stored PKCE verifier for user {telegram_id}")
             return True
         except Exception as e:
@@ -56,9 +82,10 @@ class AuthService:
             )
             return False
 
-    async def get_pkce_verifier(self, telegram_id: int) -> Optional[str]:
+    async def pop_pkce_verifier(self, telegram_id: int) -> Optional[str]:
         """
-        Non-destructively retrieves the PKCE verifier for the given Telegram user.
+        Retrieves and clears the PKCE verifier in a single statement, so each
+        verifier can be redeemed at most once.
 
         Args:
             telegram_id (int): The Telegram user ID.
@@ -70,39 +97,16 @@ class AuthService:
             return None
         try:
             async with self._pool.connection() as conn:
-                async with conn.cursor() as cursor:
-                    await cursor.execute(
-                        "SELECT code_verifier FROM sessions WHERE telegram_id = %s;",
-                        (telegram_id,),
-                    )
-                    result = await cursor.fetchone()
-                    if result and result.get("code_verifier"):
-                        return result["code_verifier"]
-                    return None
+                cursor = await conn.execute(
+                    SQL_POP_VERIFIER,
+                    (telegram_id,),
+                )
+                result = await cursor.fetchone()
+                return result["code_verifier"] if result else None
         except Exception as e:
-            logger.error(
-                f"Failed to retrieve PKCE verifier for user {telegram_id}: {e}"
-            )
+            logger.error(f"Failed to pop PKCE verifier for user {telegram_id}: {e}")
             return None
 
-    async def clear_pkce_verifier(self, telegram_id: int):
-        """
-        Clears the PKCE verifier after it has been used successfully.
-
-        Args:
-            telegram_id (int): The Telegram user ID.
-        """
-        try:
-            async with self._pool.connection() as conn:
-                async with conn.cursor() as cursor:
-                    await cursor.execute(
-                        "UPDATE sessions SET code_verifier = NULL WHERE telegram_id = %s;",
-                        (telegram_id,),
-                    )
-            logger.info(f"Successfully cleared PKCE verifier for {telegram_id}")
-        except Exception as e:
-            logger.error(f"Failed to clear PKCE verifier for {telegram_id}: {e}")
-
     async def check_user_has_session(self, user_id: int) -> bool:
         """
         Check if user has a valid session (returns True/False without raising exceptions).
@@ -119,19 +123,10 @@ class AuthService:
 
         try:
             async with self._pool.connection() as conn:
-                async with conn.cursor() as cursor:
-                    await cursor.execute(
-                        """
-                        SELECT 1 FROM sessions
-                        WHERE telegram_id = %s
-                        AND access_token IS NOT NULL
-                        AND (expires_at IS NULL OR expires_at > NOW())
-                        LIMIT 1
-                        """,
-                        (user_id,),
-                    )
-                    result = await cursor.fetchone()
-                    return result is not None
+                # Only existence matters, so skip the pool's default dict rows.
+                async with conn.cursor(row_factory=tuple_row) as cursor:
+                    await cursor.execute(SQL_CHECK_SESSION, (user_id,))
+                    return await cursor.fetchone() is not None
         except Exception as e:
             logger.error(f"Database error checking user session: {e}")
             return False
@@ -155,15 +150,10 @@ class AuthService:
             return False
         try:
             async with self._pool.connection() as conn:
-                async with conn.cursor() as cursor:
-                    await cursor.execute(
-                        """
-                        UPDATE sessions
-                        SET user_id = %s, access_token = %s
-                        WHERE telegram_id = %s
-                        """,
-                        (user_id, access_token, telegram_id),
-                    )
+                await conn.execute(
+                    SQL_SAVE_SESSION,
+                    (user_id, access_token, telegram_id),
+                )
             logger.info(
                 f"Session updated for telegram_id {telegram_id} with user_id {user_id}"
             )
@@ -175,12 +165,12 @@ class AuthService:
     async def get_user_info(self, access_token: str):
         """Get user info from BerlinHouse API using access token"""
         headers = {"Authorization": f"Bearer {access_token}"}
-        url = f"{settings.BERLINHOUSE_BASE_URL}/o/userinfo/"
 
         try:
-            async with httpx.AsyncClient(verify=False) as client:
-                response = await client.get(url, headers=headers)
-                return response.json()
+            response = await http_clients.berlinhouse.get(
+                "/o/userinfo/", headers=headers
+            )
+            return response.json()
         except Exception as e:
             logger.error(f"Error fetching user info: {e}")
             return {}
@@ -1,15 +1,23 @@
+import time
+import asyncio
+import hashlib
 import logging
+import numpy as np
 
+from functools import cache
 from datetime import timezone
+from collections.abc import Iterable
 
 from graphiti_core import Graphiti
 from openai import AsyncAzureOpenAI
 from telegram import Message as TelegramMessage
 from graphiti_core.nodes import EpisodeType, EpisodicNode
+from graphiti_core.utils.bulk_utils import RawEpisode
 from graphiti_core.llm_client import LLMConfig, OpenAIClient
 from graphiti_core.embedder.openai import OpenAIEmbedder, OpenAIEmbedderConfig
 from graphiti_core.cross_encoder.openai_reranker_client import OpenAIRerankerClient
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.schemas.generated_enums import EDGE_TYPE_MAP, NodeTypeEnum, EdgeTypeEnum
 from app.schemas.ontology import (
@@ -32,6 +40,141 @@ from app.schemas.ontology import (
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_CACHE_TTL = 24 * 60 * 60
+USER_EXISTS_CACHE_SIZE = 10_000
+USER_EXISTS_TTL = 300
+USER_ID_INDEX = "CREATE INDEX user_id_index IF NOT EXISTS FOR (n:User) ON (n.user_id)"
+
+
+class BatchingEmbedder(OpenAIEmbedder):
+    """OpenAI embedder that coalesces concurrent single-text embeds into one request."""
+
+    def __init__(
+        self,
+        config: OpenAIEmbedderConfig | None = None,
+        client: AsyncAzureOpenAI | None = None,
+    ):
+        super().__init__(config=config, client=client)
+        self.max_batch = settings.EMBEDDING_BATCH_SIZE
+        self.max_delay = settings.EMBEDDING_BATCH_DELAY_MS / 1000
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._batches: set[asyncio.Task] = set()
+
+    async def create(
+        self, input_data: str | list[str] | Iterable[int] | Iterable[Iterable[int]]
+    ) -> list[float]:
+        if isinstance(input_data, list) and len(input_data) == 1:
+            input_data = input_data[0]
+        if not isinstance(input_data, str):
+            return await super().create(input_data)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((input_data, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_delay, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._embed_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _embed_batch(self, batch: list[tuple[str, asyncio.Future]]):
+        try:
+            embeddings = await self.create_batch([text for text, _ in batch])
+        except Exception as e:
+            logger.error(f"Failed to embed batch of {len(batch)} inputs: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
+
+class CachedEmbedder(BatchingEmbedder):
+    """Batching embedder that reuses vectors for texts it has already embedded."""
+
+    def __init__(
+        self,
+        config: OpenAIEmbedderConfig | None = None,
+        client: AsyncAzureOpenAI | None = None,
+    ):
+        super().__init__(config=config, client=client)
+        self._vectors = TTLCache(
+            maxsize=settings.EMBEDDING_CACHE_SIZE, ttl=EMBEDDING_CACHE_TTL
+        )
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+    def _store(self, key: bytes, embedding: list[float]):
+        # float32 arrays take a fraction of the memory of lists of Python floats.
+        self._vectors.set(key, np.asarray(embedding, dtype=np.float32))
+
+    async def create(
+        self, input_data: str | list[str] | Iterable[int] | Iterable[Iterable[int]]
+    ) -> list[float]:
+        if isinstance(input_data, list) and len(input_data) == 1:
+            input_data = input_data[0]
+        if not isinstance(input_data, str):
+            return await super().create(input_data)
+
+        key = self._key(input_data)
+        cached = self._vectors.get(key)
+        if cached is not None:
+            return cached.tolist()
+
+        embedding = await super().create(input_data)
+        self._store(key, embedding)
+        return embedding
+
+    async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
+        keys = [self._key(text) for text in input_data_list]
+        embeddings = [self._vectors.get(key) for key in keys]
+
+        misses = {}
+        for key, text, embedding in zip(keys, input_data_list, embeddings):
+            if embedding is None:
+                misses.setdefault(key, text)
+
+        fresh = {}
+        if misses:
+            vectors = await super().create_batch(list(misses.values()))
+            fresh = dict(zip(misses, vectors))
+            for key, embedding in fresh.items():
+                self._store(key, embedding)
+
+        return [
+            fresh[key] if embedding is None else embedding.tolist()
+            for key, embedding in zip(keys, embeddings)
+        ]
+
+
+@cache
+def get_azure_openai_client() -> AsyncAzureOpenAI:
+    """Shared across reconnects so its HTTP connection pool is not rebuilt."""
+    return AsyncAzureOpenAI(
+        api_key=settings.AZURE_OPENAI_API_KEY,
+        api_version=settings.AZURE_OPENAI_API_VERSION,
+        azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
+    )
+
 
 def get_graphiti_client():
     neo4j_uri = settings.NEO4J_URI
@@ -39,24 +182,16 @@ def get_graphiti_client():
     neo4j_password = settings.NEO4J_PASSWORD
 
     if settings.OPENAI_API_KEY:
-        return Graphiti(neo4j_uri, neo4j_user, neo4j_password)
+        return Graphiti(
+            neo4j_uri, neo4j_user, neo4j_password, embedder=CachedEmbedder()
+        )
     else:
-        api_key = settings.AZURE_OPENAI_API_KEY
-        api_version = settings.AZURE_OPENAI_API_VERSION
-        llm_endpoint = settings.AZURE_OPENAI_ENDPOINT
-        embedding_endpoint = settings.AZURE_OPENAI_ENDPOINT
-
         llm_small_model = settings.RERANKER_MODEL
         llm_model = settings.MODEL
         embedding_model = settings.EMBEDDING_MODEL
 
-        llm_client_azure = AsyncAzureOpenAI(
-            api_key=api_key, api_version=api_version, azure_endpoint=llm_endpoint
-        )
-
-        embedding_client_azure = AsyncAzureOpenAI(
-            api_key=api_key, api_version=api_version, azure_endpoint=embedding_endpoint
-        )
+        # The LLM, embedder and reranker all talk to the same Azure endpoint.
+        azure_client = get_azure_openai_client()
 
         azure_llm_config = LLMConfig(
             small_model=llm_small_model,
@@ -67,14 +202,14 @@ def get_graphiti_client():
             neo4j_uri,
             neo4j_user,
             neo4j_password,
-            llm_client=OpenAIClient(config=azure_llm_config, client=llm_client_azure),
-            embedder=OpenAIEmbedder(
+            llm_client=OpenAIClient(config=azure_llm_config, client=azure_client),
+            embedder=CachedEmbedder(
                 config=OpenAIEmbedderConfig(embedding_model=embedding_model),
-                client=embedding_client_azure,
+                client=azure_client,
             ),
             cross_encoder=OpenAIRerankerClient(
                 config=LLMConfig(model=azure_llm_config.small_model),
-                client=llm_client_azure,
+                client=azure_client,
             ),
         )
 
@@ -82,6 +217,13 @@ def get_graphiti_client():
 class GraphService:
     def __init__(self):
         self.graphiti: Graphiti | None = None
+        self._version = 0
+        self._version_at = time.monotonic()
+        self._changed = False
+        # Only confirmed members are cached so newly added users get in at once.
+        self._known_users = TTLCache(
+            maxsize=USER_EXISTS_CACHE_SIZE, ttl=USER_EXISTS_TTL
+        )
         self.entity_types = {
             NodeTypeEnum.User.value: User,
             NodeTypeEnum.Topic.value: Topic,
@@ -102,17 +244,54 @@ class GraphService:
             EdgeTypeEnum.RelatedTo.value: RelatedTo,
         }
         self.edge_type_map = EDGE_TYPE_MAP
+        # None is the shutdown sentinel; see close().
+        self._episode_queue: asyncio.Queue[RawEpisode | None] = asyncio.Queue(
+            maxsize=settings.EPISODE_QUEUE_SIZE
+        )
+        self._flush_task: asyncio.Task | None = None
+        self._flush_batch: list[RawEpisode] = []
+
+    @property
+    def version(self) -> int:
+        """Cache key for the graph's contents.
+
+        Advances at most once per GRAPH_CACHE_STALENESS seconds, so steady group
+        chat ingestion does not invalidate the search caches on every batch.
+        """
+        now = time.monotonic()
+        if self._changed and now - self._version_at >= settings.GRAPH_CACHE_STALENESS:
+            self._version += 1
+            self._version_at = now
+            self._changed = False
+        return self._version
 
     async def connect(self):
         try:
             self.graphiti = get_graphiti_client()
             logger.info("Graph service connected to Graphiti")
             await self.graphiti.build_indices_and_constraints()
+            await self.graphiti.driver.execute_query(USER_ID_INDEX)
+            self._flush_task = asyncio.create_task(self._flush_episodes())
         except Exception as e:
             logger.error(f"Failed to connect to graph service: {e}")
             raise
 
     async def close(self):
+        if self._flush_task:
+            try:
+                await asyncio.wait_for(
+                    self._stop_flusher(), timeout=settings.EPISODE_DRAIN_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                self._flush_task.cancel()
+                await asyncio.gather(self._flush_task, return_exceptions=True)
+                dropped = len(self._flush_batch)
+                while not self._episode_queue.empty():
+                    if self._episode_queue.get_nowait() is not None:
+                        dropped += 1
+                logger.warning(f"Dropping up to {dropped} episodes pending at shutdown")
+            self._flush_task = None
+
         if self.graphiti:
             try:
                 await self.graphiti.close()
@@ -122,6 +301,9 @@ class GraphService:
 
     async def check_user_exists(self, message: TelegramMessage):
         user_id = message.from_user.id
+        if user_id in self._known_users:
+            return True
+
         cypher = """
         MATCH (n:User {user_id: $user_id})
         RETURN n.user_id
@@ -130,27 +312,95 @@ class GraphService:
         result = await self.graphiti.driver.execute_query(cypher, user_id=user_id)
 
         records = getattr(result, "records", None)
-        if records is not None:
-            return len(records) > 0
-        return bool(result)
+        exists = len(records) > 0 if records is not None else bool(result)
+        if exists:
+            self._known_users.set(user_id, True)
+        return exists
 
     async def add_episode(self, message: TelegramMessage):
+        """Queue a group message for the background flusher to ingest."""
+        episode = RawEpisode(
+            name=f"telegram_message_{message.message_id}",
+            content=message.to_json(),
+            source=EpisodeType.json,
+            source_description="TowerBot",
+            reference_time=message.date.astimezone(timezone.utc),
+        )
+        try:
+            self._episode_queue.put_nowait(episode)
+        except asyncio.QueueFull:
+            logger.warning(f"Episode queue full, dropping message {message.message_id}")
+
+    async def _stop_flusher(self):
+        # Queued behind every pending episode, so the flusher ingests them all,
+        # including its in-progress batch, before it exits.
+        await self._episode_queue.put(None)
+        await self._flush_task
+
+    async def _flush_episodes(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            episode = await self._episode_queue.get()
+            if episode is None:
+                return
+
+            batch = [episode]
+            deadline = loop.time() + settings.EPISODE_FLUSH_INTERVAL
+            while len(batch) < settings.EPISODE_BATCH_SIZE:
+                try:
+                    episode = await asyncio.wait_for(
+                        self._episode_queue.get(), deadline - loop.time()
+                    )
+                except TimeoutError:
+                    break
+                if episode is None:
+                    stopping = True
+                    break
+                batch.append(episode)
+
+            self._flush_batch = batch
+            await self._add_episodes(batch)
+            self._flush_batch = []
+
+    async def _add_episodes(self, episodes: list[RawEpisode]):
+        if settings.EPISODE_BULK_INGEST:
+            await self._add_episodes_bulk(episodes)
+            return
+
+        for episode in episodes:
+            try:
+                await self.graphiti.add_episode(
+                    name=episode.name,
+                    episode_body=episode.content,
+                    source=episode.source,
+                    source_description=episode.source_description,
+                    reference_time=episode.reference_time,
+                    group_id=str(settings.GROUP_ID),
+                    entity_types=self.entity_types,
+                    excluded_entity_types=["Topic", "Floor"],
+                    edge_types=self.edge_types,
+                    edge_type_map=self.edge_type_map,
+                )
+                self._changed = True
+            except Exception as e:
+                logger.error(f"Failed to process episode {episode.name}: {e}")
+
+    async def _add_episodes_bulk(self, episodes: list[RawEpisode]):
+        # The bulk path skips edge invalidation and valid_at/invalid_at extraction.
         try:
-            await self.graphiti.add_episode(
-                name=f"telegram_message_{message.message_id}",
-                episode_body=message.to_json(),
-                source=EpisodeType.json,
-                source_description="TowerBot",
-                reference_time=message.date.astimezone(timezone.utc),
+            await self.graphiti.add_episode_bulk(
+                episodes,
                 group_id=str(settings.GROUP_ID),
                 entity_types=self.entity_types,
                 excluded_entity_types=["Topic", "Floor"],
                 edge_types=self.edge_types,
                 edge_type_map=self.edge_type_map,
             )
+            self._changed = True
         except Exception as e:
-            logger.error(f"Failed to process message {message.message_id}: {e}")
-            raise
+            # Episodes are saved before extraction, so retrying would duplicate them.
+            logger.error(f"Failed to add batch of {len(episodes)} episodes: {e}")
 
     async def reprocess_all_episodes(self):
         try:
@@ -165,6 +415,7 @@ class GraphService:
                 edge_types=self.edge_types,
                 edge_type_map=self.edge_type_map,
             )
+            self._version += 1
             logger.info(f"Reprocessed {len(episodes)} episodes")
         except Exception as e:
             logger.error(f"Failed to reprocess episodes: {e}")
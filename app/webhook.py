@@ -1,10 +1,10 @@
 import logging
 import asyncio
 
-from telegram import Update
 from telegram.ext import Application, ApplicationBuilder
 
 from app.core.config import settings
+from app.core.constants import HANDLED_UPDATE_TYPES
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +17,9 @@ async def webhook():
     logger.info("Setting Telegram webhook...")
 
     await tg_app.bot.set_webhook(
-        url=webhook_url, allowed_updates=Update.ALL_TYPES, drop_pending_updates=True
+        url=webhook_url,
+        allowed_updates=sorted(HANDLED_UPDATE_TYPES),
+        drop_pending_updates=True,
     )
 
     logger.info(f"Webhook set to {webhook_url}")
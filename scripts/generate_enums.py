@@ -6,6 +6,26 @@ from pathlib import Path
 from typing import List, Tuple, Dict
 
 
+ONTOLOGY_CONSTANTS = {"label", "source_types", "target_types"}
+
+
+def extract_class_constants(class_node: ast.ClassDef) -> Dict[str, object]:
+    constants = {}
+
+    for item in class_node.body:
+        if isinstance(item, ast.AnnAssign) and item.value is not None:
+            target, value = item.target, item.value
+        elif isinstance(item, ast.Assign) and len(item.targets) == 1:
+            target, value = item.targets[0], item.value
+        else:
+            continue
+
+        if isinstance(target, ast.Name) and target.id in ONTOLOGY_CONSTANTS:
+            constants[target.id] = ast.literal_eval(value)
+
+    return constants
+
+
 def extract_ontology_types():
     script_dir = Path(__file__).parent
     ontology_path = script_dir.parent / "app" / "schemas" / "ontology.py"
@@ -21,84 +41,22 @@ def extract_ontology_types():
     edge_type_map = {}
 
     for node in ast.walk(tree):
-        if isinstance(node, ast.ClassDef):
-            class_name = node.name
-
-            for class_body_item in node.body:
-                if (
-                    isinstance(class_body_item, ast.ClassDef)
-                    and class_body_item.name == "Config"
-                ):
-                    for config_item in class_body_item.body:
-                        if (
-                            isinstance(config_item, ast.Assign)
-                            and len(config_item.targets) == 1
-                            and isinstance(config_item.targets[0], ast.Name)
-                            and config_item.targets[0].id == "label"
-                        ):
-                            if isinstance(config_item.value, ast.Constant):
-                                label = config_item.value.value
-
-                                relationship_classes = {
-                                    "Sent",
-                                    "SentIn",
-                                    "InReplyTo",
-                                    "LocatedOn",
-                                    "WorksOn",
-                                    "Attends",
-                                    "InterestedIn",
-                                    "RelatedTo",
-                                }
-
-                                if (
-                                    label.isupper()
-                                    and "_" in label
-                                    or class_name in relationship_classes
-                                ):
-                                    edge_types.append(label)
-
-                                    source_types = []
-                                    target_types = []
-
-                                    for config_item in class_body_item.body:
-                                        if isinstance(config_item, ast.Assign):
-                                            if len(
-                                                config_item.targets
-                                            ) == 1 and isinstance(
-                                                config_item.targets[0], ast.Name
-                                            ):
-                                                attr_name = config_item.targets[0].id
-                                                if (
-                                                    attr_name == "source_types"
-                                                    and isinstance(
-                                                        config_item.value, ast.List
-                                                    )
-                                                ):
-                                                    source_types = [
-                                                        elt.value
-                                                        for elt in config_item.value.elts
-                                                        if isinstance(elt, ast.Constant)
-                                                    ]
-                                                elif (
-                                                    attr_name == "target_types"
-                                                    and isinstance(
-                                                        config_item.value, ast.List
-                                                    )
-                                                ):
-                                                    target_types = [
-                                                        elt.value
-                                                        for elt in config_item.value.elts
-                                                        if isinstance(elt, ast.Constant)
-                                                    ]
-
-                                    for source_type in source_types:
-                                        for target_type in target_types:
-                                            key = (source_type, target_type)
-                                            if key not in edge_type_map:
-                                                edge_type_map[key] = []
-                                            edge_type_map[key].append(label)
-                                else:
-                                    node_types.append(label)
+        if not isinstance(node, ast.ClassDef):
+            continue
+
+        constants = extract_class_constants(node)
+        label = constants.get("label")
+        if not isinstance(label, str):
+            continue
+
+        if "source_types" not in constants and "target_types" not in constants:
+            node_types.append(label)
+            continue
+
+        edge_types.append(label)
+        for source_type in constants.get("source_types", []):
+            for target_type in constants.get("target_types", []):
+                edge_type_map.setdefault((source_type, target_type), []).append(label)
 
     return sorted(node_types), sorted(edge_types), edge_type_map
 
@@ -108,17 +66,21 @@ def generate_enum_code(
     edge_types: List[str],
     edge_type_map: Dict[Tuple[str, str], List[str]],
 ):
-    code = """from enum import Enum
+    code = """from enum import StrEnum
+from typing import Literal
 
-class NodeTypeEnum(str, Enum):
+class NodeTypeEnum(StrEnum):
 """
 
     for node_type in node_types:
         enum_name = node_type
         code += f'    {enum_name} = "{node_type}"\n'
 
+    node_type_values = ", ".join(f'"{node_type}"' for node_type in node_types)
+    code += f"\nNodeTypeLiteral = Literal[{node_type_values}]\n"
+
     code += """
-class EdgeTypeEnum(str, Enum):
+class EdgeTypeEnum(StrEnum):
 """
 
     for edge_type in edge_types:
@@ -129,11 +91,9 @@ class EdgeTypeEnum(str, Enum):
 """
 
     for (source_type, target_type), edge_type_list in sorted(edge_type_map.items()):
-        edge_types_str = (
-            "["
-            + ", ".join(f'"{edge_type}"' for edge_type in sorted(edge_type_list))
-            + "]"
-        )
+        edge_type_names = [f'"{edge_type}"' for edge_type in sorted(edge_type_list)]
+        trailing_comma = "," if len(edge_type_names) == 1 else ""
+        edge_types_str = f"({', '.join(edge_type_names)}{trailing_comma})"
         code += f'    ("{source_type}", "{target_type}"): {edge_types_str},\n'
 
     code += "}\n"
@@ -5,4 +5,4 @@ uv run python scripts/generate_enums.py
 uv run python -m app.webhook &
 
 # 3. Start the main web server in the foreground
-uv run uvicorn app.main:app --reload --port 8000 --host 0.0.0.0
\ No newline at end of file
+uv run uvicorn app.main:app --reload --loop uvloop --http httptools --port 8000 --host 0.0.0.0
\ No newline at end of file